@@ -5,11 +5,15 @@ Flask backend for PWA
 """
 
 import os
-import json
+import hashlib
+import threading
 from datetime import datetime
-from pathlib import Path
 from flask import Flask, request, jsonify, send_from_directory
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from flask_compress import Compress
+import orjson
+from cachetools import TTLCache
 import sys
 
 # Add scripts to path
@@ -17,20 +21,52 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'scripts'))
 
 from fetch_articles import NewsFetcher
 from generate_dispatch import FortParser, DispatchGenerator
+from dispatch_index import DispatchIndex
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
 
 app = Flask(__name__, static_folder='public')
+app.json = OrjsonProvider(app)
 CORS(app)
+Compress(app)
+
+# Hand static file bodies to a fronting web server (Apache/lighttpd X-Sendfile)
+app.config['USE_X_SENDFILE'] = os.getenv('USE_X_SENDFILE', 'false').lower() == 'true'
+
+# PWA entry points that must be revalidated on every load
+NO_CACHE_FILES = {'index.html', 'service-worker.js', 'manifest.json'}
+
+# Store articles temporarily in memory, bounded and expiring after an hour
+# (per-process: with several gunicorn workers, use Redis/DB instead)
+article_cache = TTLCache(maxsize=10000, ttl=3600)
+article_cache_lock = threading.Lock()
 
-# Store articles temporarily in memory (in production, use Redis/DB)
-article_cache = {}
+# Dispatch metadata index (built from dispatch/ on first run)
+dispatch_index = DispatchIndex('dispatch')
+
+def _send_public(path):
+    """Serve a file from public/ with conditional GET and Range support"""
+    max_age = 0 if path in NO_CACHE_FILES else 86400
+    return send_from_directory('public', path, conditional=True, max_age=max_age)
 
 @app.route('/')
 def serve_pwa():
-    return send_from_directory('public', 'index.html')
+    return _send_public('index.html')
 
 @app.route('/<path:path>')
 def serve_static(path):
-    return send_from_directory('public', path)
+    return _send_public(path)
 
 @app.route('/api/fetch-news')
 def fetch_news():
@@ -62,33 +98,50 @@ def fetch_news():
                 return jsonify({'error': 'Topic required for search'}), 400
             articles = fetcher.fetch_articles(topic, page_size=limit)
         
-        # Cache articles
-        for i, article in enumerate(articles):
-            article_id = f"{datetime.now().timestamp()}_{i}"
-            article_cache[article_id] = article
+        # Tag articles with IDs and cache them in a single pass
+        now_ts = datetime.now().timestamp()
+        with article_cache_lock:
+            for i, article in enumerate(articles):
+                article_id = f"{now_ts}_{i}"
+                article['id'] = article_id
+                article_cache[article_id] = article
         
-        # Return with IDs
-        return jsonify({
-            'articles': [
-                {**article, 'id': f"{datetime.now().timestamp()}_{i}"}
-                for i, article in enumerate(articles)
-            ]
-        })
+        return jsonify({'articles': articles})
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _dispatch_payload(article, analysis, filepath):
+    """Build the API representation of a generated dispatch"""
+    return {
+        'title': article['title'],
+        'summary': analysis['summary'],
+        'fort_frame': analysis['fort_frame'],
+        'tags': analysis['tags'],
+        'voice': analysis['voice_family'],
+        'impact_zones': analysis['impact_zones'],
+        'url': article['url'],
+        'filepath': str(filepath),
+        'fnafi_command': f'fnafi read "{filepath}"'
+    }
+
 @app.route('/api/generate-dispatch', methods=['POST'])
 def generate_dispatch():
-    """Generate Fort dispatch from article"""
+    """Generate Fort dispatch from article (or a batch via article_ids)"""
     try:
         data = request.json
+        article_ids = data.get('article_ids')
+        
+        if article_ids is not None:
+            return generate_dispatches(article_ids)
+        
         article_id = data.get('article_id')
         
-        if not article_id or article_id not in article_cache:
-            return jsonify({'error': 'Invalid article ID'}), 400
+        with article_cache_lock:
+            article = article_cache.get(article_id) if article_id else None
         
-        article = article_cache[article_id]
+        if article is None:
+            return jsonify({'error': 'Invalid article ID'}), 400
         
         # Generate Fort analysis
         parser = FortParser(llm_provider='none')  # Use basic analysis for demo
@@ -99,21 +152,46 @@ def generate_dispatch():
         filepath = generator.generate_dispatch(article, analysis)
         
         # Return dispatch data
-        return jsonify({
-            'title': article['title'],
-            'summary': analysis['summary'],
-            'fort_frame': analysis['fort_frame'],
-            'tags': analysis['tags'],
-            'voice': analysis['voice_family'],
-            'impact_zones': analysis['impact_zones'],
-            'url': article['url'],
-            'filepath': str(filepath),
-            'fnafi_command': f'fnafi read "{filepath}"'
-        })
+        return jsonify(_dispatch_payload(article, analysis, filepath))
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def generate_dispatches(article_ids):
+    """Generate dispatches for several cached articles in one request"""
+    if not isinstance(article_ids, list) or not article_ids:
+        return jsonify({'error': 'article_ids must be a non-empty list'}), 400
+    
+    with article_cache_lock:
+        articles = [article_cache.get(article_id) for article_id in article_ids]
+    
+    if any(article is None for article in articles):
+        return jsonify({'error': 'Invalid article ID'}), 400
+    
+    # Analyses run concurrently when an LLM provider is configured
+    parser = FortParser(llm_provider='none')  # Use basic analysis for demo
+    analyses = parser.analyze_articles(articles)
+    
+    generator = DispatchGenerator()
+    filepaths = generator.generate_dispatches(list(zip(articles, analyses)))
+    
+    return jsonify({
+        'dispatches': [
+            _dispatch_payload(article, analysis, filepath)
+            for article, analysis, filepath in zip(articles, analyses, filepaths)
+        ]
+    })
+
+def _matching_etag(etag):
+    """Client ETag matching etag, including Flask-Compress '<etag>:<encoding>' variants"""
+    if_none_match = request.if_none_match
+    if if_none_match.contains(etag):
+        return etag
+    for tag in if_none_match.as_set(include_weak=True):
+        if tag.split(':', 1)[0] == etag:
+            return tag
+    return None
+
 @app.route('/api/dispatches')
 def get_dispatches():
     """Get saved dispatches"""
@@ -121,45 +199,20 @@ def get_dispatches():
         tag = request.args.get('tag')
         date = request.args.get('date')
         
-        dispatches = []
-        dispatch_dir = Path('dispatch')
-        
-        if not dispatch_dir.exists():
-            return jsonify({'dispatches': []})
-        
-        for date_dir in dispatch_dir.iterdir():
-            if date_dir.is_dir():
-                for file in date_dir.glob('*.md'):
-                    # Read frontmatter
-                    with open(file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        if content.startswith('---'):
-                            _, frontmatter, _ = content.split('---', 2)
-                            # Parse frontmatter (simple parsing)
-                            metadata = {}
-                            for line in frontmatter.strip().split('\n'):
-                                if ': ' in line:
-                                    key, value = line.split(': ', 1)
-                                    metadata[key] = value.strip('"')
-                            
-                            # Apply filters
-                            if tag and tag not in metadata.get('tags', ''):
-                                continue
-                            if date and date != metadata.get('date', ''):
-                                continue
-                            
-                            dispatches.append({
-                                'file': str(file),
-                                'title': metadata.get('title', ''),
-                                'date': metadata.get('date', ''),
-                                'tags': json.loads(metadata.get('tags', '[]')),
-                                'voice': metadata.get('voice', ''),
-                                'summary': metadata.get('summary', '')
-                            })
-        
-        return jsonify({
-            'dispatches': sorted(dispatches, key=lambda x: x['date'], reverse=True)
-        })
+        # Unchanged index and filters mean an unchanged listing
+        etag = hashlib.md5(f"{dispatch_index.version()}:{tag}:{date}".encode()).hexdigest()
+        matched = _matching_etag(etag)
+        if matched:
+            response = app.response_class(status=304)
+            response.set_etag(matched)
+            return response
+        
+        dispatches = dispatch_index.query(tag=tag, date=date)
+        
+        response = jsonify({'dispatches': dispatches})
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, must-revalidate'
+        return response
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
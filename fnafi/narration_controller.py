@@ -5,18 +5,42 @@ Manages text-to-speech narration for Fort Sentinel Dispatches
 """
 
 import os
+import re
+import time
+import atexit
+import selectors
+from itertools import islice
+import sys
 import json
 import argparse
 import subprocess
 from pathlib import Path
 from datetime import datetime
 import frontmatter
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+# Add scripts to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from dispatch_index import DispatchIndex
+
+# Body of the Fort Frame section, up to the next heading
+_FRAME_RE = re.compile(r'##\s*🧠\s*Fort Frame[ \t]*\n(.*?)(?=^##|\Z)', re.S | re.M)
 
 class FNAFIController:
-    def __init__(self, fnafi_path: Optional[str] = None):
+    def __init__(self, fnafi_path: Optional[str] = None, daemon: bool = False,
+                 daemon_timeout: float = 30.0):
         self.fnafi_path = fnafi_path or "fnafi"
         self.dispatch_dir = Path("dispatch")
+        self.index = DispatchIndex(self.dispatch_dir)
+        
+        # Optional long-lived `fnafi daemon` process fed newline-delimited JSON
+        self.daemon = daemon
+        self.daemon_timeout = daemon_timeout
+        self.proc = None
+        self._daemon_buffer = b""
+        if daemon:
+            atexit.register(self.close)
         
         # Voice personality mappings
         self.voice_mappings = {
@@ -60,25 +84,104 @@ class FNAFIController:
         # Prepare narration text
         narration_text = self._prepare_narration(post)
         
-        # Execute FNAFI command
+        try:
+            if self.daemon:
+                ok, error = self._daemon_read(voice_config, narration_text)
+            else:
+                ok, error = self._run_read(voice_config, narration_text)
+            
+            if ok:
+                print(f"✅ Narration started for: {post.metadata['title']}")
+                print(f"🎭 Voice: {voice_family}")
+            else:
+                print(f"❌ Narration failed: {error}")
+        except Exception as e:
+            print(f"❌ Error executing FNAFI: {e}")
+    
+    def _run_read(self, voice_config: Dict, text: str) -> Tuple[bool, str]:
+        """Run a one-off `fnafi read` process"""
+        
         cmd = [
             self.fnafi_path,
             "read",
             "--voice", voice_config['voice'],
             "--speed", str(voice_config['speed']),
             "--pitch", str(voice_config['pitch']),
-            "--text", narration_text
+            "--text", text
         ]
         
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        return result.returncode == 0, result.stderr
+    
+    def _daemon_read(self, voice_config: Dict, text: str) -> Tuple[bool, str]:
+        """Send a read request to the long-lived FNAFI daemon"""
+        
+        if self.proc is None or self.proc.poll() is not None:
+            self.proc = subprocess.Popen(
+                [self.fnafi_path, "daemon"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                bufsize=0
+            )
+            self._daemon_buffer = b""
+        
+        request = {
+            "cmd": "read",
+            "voice": voice_config['voice'],
+            "speed": voice_config['speed'],
+            "pitch": voice_config['pitch'],
+            "text": text
+        }
+        self.proc.stdin.write((json.dumps(request) + "\n").encode('utf-8'))
+        self.proc.stdin.flush()
+        
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                print(f"✅ Narration started for: {post.metadata['title']}")
-                print(f"🎭 Voice: {voice_family}")
-            else:
-                print(f"❌ Narration failed: {result.stderr}")
-        except Exception as e:
-            print(f"❌ Error executing FNAFI: {e}")
+            line = self._read_daemon_line()
+        except TimeoutError:
+            # The daemon's state is unknown; restart it on the next request
+            self.close()
+            return False, f"FNAFI daemon did not reply within {self.daemon_timeout}s"
+        
+        if line is None:
+            return False, "FNAFI daemon exited"
+        
+        response = json.loads(line)
+        return response.get("ok", False), response.get("error", "")
+    
+    def _read_daemon_line(self) -> Optional[bytes]:
+        """Read one reply line from the daemon; None if it exited"""
+        
+        deadline = time.monotonic() + self.daemon_timeout
+        fd = self.proc.stdout.fileno()
+        
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while b"\n" not in self._daemon_buffer:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not selector.select(remaining):
+                    raise TimeoutError()
+                
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    return None
+                self._daemon_buffer += chunk
+        
+        line, _, self._daemon_buffer = self._daemon_buffer.partition(b"\n")
+        return line
+    
+    def close(self):
+        """Stop the FNAFI daemon if one is running"""
+        
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.stdin.close()
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        self.proc = None
+        self._daemon_buffer = b""
     
     def _prepare_narration(self, post: frontmatter.Post) -> str:
         """Prepare text for narration"""
@@ -93,11 +196,9 @@ class FNAFIController:
         sections.append(f"Date: {post.metadata['date']}")
         
         # Fort Frame (emotional truth)
-        if '## 🧠 Fort Frame' in post.content:
-            frame_start = post.content.find('## 🧠 Fort Frame') + len('## 🧠 Fort Frame')
-            frame_end = post.content.find('##', frame_start)
-            frame_text = post.content[frame_start:frame_end].strip()
-            sections.append(f"Fort Frame: {frame_text}")
+        frame = _FRAME_RE.search(post.content)
+        if frame:
+            sections.append(f"Fort Frame: {frame.group(1).strip()}")
         
         # Summary
         if post.metadata.get('summary'):
@@ -113,36 +214,31 @@ class FNAFIController:
     def list_dispatches(self, tag: Optional[str] = None, date: Optional[str] = None) -> List[Dict]:
         """List available dispatches with optional filtering"""
         
-        dispatches = []
-        
-        for date_dir in self.dispatch_dir.iterdir():
-            if date_dir.is_dir():
-                for file in date_dir.glob("*.md"):
-                    with open(file, 'r', encoding='utf-8') as f:
-                        post = frontmatter.load(f)
-                    
-                    # Apply filters
-                    if tag and tag not in post.metadata.get('tags', []):
-                        continue
-                    if date and date != str(post.metadata.get('date')):
-                        continue
-                    
-                    dispatches.append({
-                        "file": str(file),
-                        "title": post.metadata['title'],
-                        "date": post.metadata['date'],
-                        "tags": post.metadata.get('tags', []),
-                        "voice": post.metadata.get('voice', 'TruthKeeper')
-                    })
-        
-        return sorted(dispatches, key=lambda x: x['date'], reverse=True)
+        return [
+            {
+                "file": d['file'],
+                "title": d['title'],
+                "date": d['date'],
+                "tags": d['tags'],
+                "voice": d['voice'] or 'TruthKeeper'
+            }
+            for d in self.index.query(tag=tag, date=date)
+        ]
+    
+    def _existing(self, dispatches: List[Dict]):
+        """Yield dispatches whose files still exist, dropping stale index rows"""
+        
+        for dispatch in dispatches:
+            if os.path.exists(dispatch['file']):
+                yield dispatch
+            else:
+                self.index.remove(dispatch['file'])
     
     def read_latest(self, tag: Optional[str] = None):
         """Read the latest dispatch"""
         
-        dispatches = self.list_dispatches(tag=tag)
-        if dispatches:
-            latest = dispatches[0]
+        latest = next(self._existing(self.list_dispatches(tag=tag)), None)
+        if latest:
             print(f"📰 Reading latest dispatch: {latest['title']}")
             self.read_dispatch(latest['file'])
         else:
@@ -151,7 +247,7 @@ class FNAFIController:
     def batch_narrate(self, date: Optional[str] = None, limit: int = 5):
         """Narrate multiple dispatches in sequence"""
         
-        dispatches = self.list_dispatches(date=date)[:limit]
+        dispatches = list(islice(self._existing(self.list_dispatches(date=date)), limit))
         
         print(f"🎙️ Batch narration: {len(dispatches)} dispatches")
         
@@ -165,6 +261,8 @@ class FNAFIController:
 
 def main():
     parser = argparse.ArgumentParser(description="FNAFI narration controller for Fort Sentinel")
+    parser.add_argument('--daemon', action='store_true',
+                        help='Reuse one `fnafi daemon` process instead of spawning per dispatch')
     
     subparsers = parser.add_subparsers(dest='command', help='Commands')
     
@@ -187,7 +285,7 @@ def main():
     
     args = parser.parse_args()
     
-    controller = FNAFIController()
+    controller = FNAFIController(daemon=args.daemon)
     
     if args.command == 'read':
         if args.latest:
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Fort Sentinel Adaptive Limiter
+Concurrency limit for LLM calls that adapts to provider rate limits
+"""
+
+import threading
+from contextlib import contextmanager
+
+class AdaptiveLimiter:
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 16,
+                 grow_after: int = 100):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.grow_after = grow_after
+
+        self._in_flight = 0
+        self._successes = 0
+        self._saturated = False
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self):
+        """Hold one of the currently allowed concurrent slots"""
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._saturated = True
+                self._cond.wait()
+            self._in_flight += 1
+
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def record_success(self):
+        """Raise the limit after a run of successes while callers were waiting"""
+        with self._cond:
+            self._successes += 1
+            if self._successes < self.grow_after:
+                return
+
+            if self._saturated and self.limit < self.maximum:
+                self.limit += 1
+                self._cond.notify_all()
+            self._successes = 0
+            self._saturated = False
+
+    def record_rate_limit(self):
+        """Lower the limit after the provider rejected a call as rate limited"""
+        with self._cond:
+            self.limit = max(self.minimum, self.limit - 1)
+            self._successes = 0
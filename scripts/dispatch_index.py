@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Fort Sentinel Dispatch Index
+SQLite metadata index over generated dispatch files
+"""
+
+import os
+import secrets
+import sqlite3
+import threading
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import orjson
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dispatches (
+    file TEXT PRIMARY KEY,
+    title TEXT,
+    date TEXT,
+    tags TEXT,
+    voice TEXT,
+    summary TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_dispatches_date ON dispatches(date);
+CREATE TABLE IF NOT EXISTS dispatch_tags (
+    file TEXT,
+    tag TEXT,
+    PRIMARY KEY (file, tag)
+);
+CREATE INDEX IF NOT EXISTS idx_dispatch_tags_tag ON dispatch_tags(tag);
+CREATE TABLE IF NOT EXISTS dispatch_dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER
+);
+CREATE TABLE IF NOT EXISTS index_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER
+);
+"""
+
+# Index databases already rebuilt from disk by this process
+_reindexed = set()
+_reindex_lock = threading.Lock()
+
+class DispatchIndex:
+    def __init__(self, dispatch_dir: str = "dispatch"):
+        self.dispatch_dir = Path(dispatch_dir)
+        self.dispatch_dir.mkdir(exist_ok=True)
+        self.db_path = self.dispatch_dir / "index.db"
+
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+            # Random per-database id, so a rebuilt index.db never reuses versions
+            with conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO index_meta (key, value) VALUES ('db_id', ?)",
+                    (secrets.randbits(62),)
+                )
+
+        # Sync with disk once per process, picking up files added or
+        # removed outside DispatchGenerator
+        with _reindex_lock:
+            key = os.path.abspath(self.db_path)
+            if key not in _reindexed:
+                self.reindex()
+                _reindexed.add(key)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def add(self, filepath: str, metadata: Dict):
+        """Insert or replace a dispatch entry"""
+        with closing(self._connect()) as conn, conn:
+            self._upsert(conn, filepath, metadata)
+            self._bump_version(conn)
+
+    def add_many(self, entries: List[Tuple[str, Dict]]):
+        """Insert or replace several dispatch entries in one transaction"""
+        with closing(self._connect()) as conn, conn:
+            for filepath, metadata in entries:
+                self._upsert(conn, filepath, metadata)
+            self._bump_version(conn)
+
+    def remove(self, filepath: str):
+        """Drop a dispatch entry"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM dispatches WHERE file = ?", (filepath,))
+            conn.execute("DELETE FROM dispatch_tags WHERE file = ?", (filepath,))
+            self._bump_version(conn)
+
+    @staticmethod
+    def _row(metadata: Dict) -> Tuple:
+        """Column values (after file) stored for a dispatch"""
+        return (
+            metadata.get('title', ''),
+            metadata.get('date', ''),
+            orjson.dumps(metadata.get('tags', [])).decode(),
+            metadata.get('voice', ''),
+            metadata.get('summary', '')
+        )
+
+    def _upsert(self, conn: sqlite3.Connection, filepath: str, metadata: Dict):
+        conn.execute(
+            "INSERT OR REPLACE INTO dispatches (file, title, date, tags, voice, summary) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (filepath,) + self._row(metadata)
+        )
+        conn.execute("DELETE FROM dispatch_tags WHERE file = ?", (filepath,))
+        conn.executemany(
+            "INSERT OR IGNORE INTO dispatch_tags (file, tag) VALUES (?, ?)",
+            [(filepath, tag) for tag in metadata.get('tags', [])]
+        )
+
+    @staticmethod
+    def _bump_version(conn: sqlite3.Connection):
+        conn.execute(
+            "INSERT INTO index_meta (key, value) VALUES ('version', 1) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + 1"
+        )
+
+    def version(self) -> str:
+        """Database id and write counter; changes whenever the index is written"""
+        with closing(self._connect()) as conn:
+            meta = dict(conn.execute("SELECT key, value FROM index_meta").fetchall())
+
+        return f"{meta.get('db_id', 0)}:{meta.get('version', 0)}"
+
+    def query(self, tag: Optional[str] = None, date: Optional[str] = None) -> List[Dict]:
+        """Return dispatch metadata, newest first, with optional filtering"""
+        sql = "SELECT file, title, date, tags, voice, summary FROM dispatches d"
+        clauses = []
+        params = []
+
+        if tag:
+            clauses.append("EXISTS (SELECT 1 FROM dispatch_tags t WHERE t.file = d.file AND t.tag = ?)")
+            params.append(tag)
+        if date:
+            clauses.append("d.date = ?")
+            params.append(date)
+
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY d.date DESC"
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        return [
+            {
+                'file': row['file'],
+                'title': row['title'],
+                'date': row['date'],
+                'tags': orjson.loads(row['tags'] or '[]'),
+                'voice': row['voice'],
+                'summary': row['summary']
+            }
+            for row in rows
+        ]
+
+    def reindex(self):
+        """Bring the index in line with the dispatch tree
+
+        Only date directories whose mtime changed since the last run are
+        re-read, and the version is bumped only if indexed rows changed.
+        """
+        with closing(self._connect()) as conn, conn:
+            known = dict(conn.execute("SELECT path, mtime_ns FROM dispatch_dirs").fetchall())
+            seen = set()
+            changed = False
+
+            # scandir answers is_dir()/is_file() from the directory listing
+            with os.scandir(self.dispatch_dir) as date_dirs:
+                for date_dir in date_dirs:
+                    if not date_dir.is_dir(follow_symlinks=False):
+                        continue
+                    seen.add(date_dir.path)
+
+                    # Taken before reading, so files added meanwhile trigger a rescan next time
+                    mtime_ns = date_dir.stat(follow_symlinks=False).st_mtime_ns
+                    if known.get(date_dir.path) == mtime_ns:
+                        continue
+
+                    changed |= self._replace_dir(conn, date_dir.path, self._scan_dir(date_dir.path))
+                    conn.execute(
+                        "INSERT OR REPLACE INTO dispatch_dirs (path, mtime_ns) VALUES (?, ?)",
+                        (date_dir.path, mtime_ns)
+                    )
+
+            # Date directories removed from disk
+            for path in known.keys() - seen:
+                changed |= self._replace_dir(conn, path, {})
+                conn.execute("DELETE FROM dispatch_dirs WHERE path = ?", (path,))
+
+            if changed:
+                self._bump_version(conn)
+
+    def _scan_dir(self, path: str) -> Dict[str, Dict]:
+        """Parse every dispatch in one date directory"""
+        entries = {}
+        with os.scandir(path) as files:
+            for file in files:
+                if not file.name.endswith('.md') or not file.is_file():
+                    continue
+                try:
+                    metadata = self._read_metadata(file.path)
+                except (ValueError, UnicodeDecodeError, OSError) as e:
+                    print(f"Skipping unreadable dispatch {file.path}: {e}")
+                    continue
+                if metadata is not None:
+                    entries[file.path] = metadata
+        return entries
+
+    def _replace_dir(self, conn: sqlite3.Connection, path: str, entries: Dict[str, Dict]) -> bool:
+        """Replace the rows under one date directory; return whether anything changed"""
+        prefix = path + os.sep
+        current = {
+            row['file']: tuple(row)[1:]
+            for row in conn.execute(
+                "SELECT file, title, date, tags, voice, summary FROM dispatches "
+                "WHERE substr(file, 1, ?) = ?",
+                (len(prefix), prefix)
+            )
+        }
+        wanted = {filepath: self._row(metadata) for filepath, metadata in entries.items()}
+        if current == wanted:
+            return False
+
+        for filepath in current:
+            conn.execute("DELETE FROM dispatches WHERE file = ?", (filepath,))
+            conn.execute("DELETE FROM dispatch_tags WHERE file = ?", (filepath,))
+        for filepath, metadata in entries.items():
+            self._upsert(conn, filepath, metadata)
+        return True
+
+    @staticmethod
+    def _read_metadata(file: str) -> Optional[Dict]:
+        """Parse dispatch frontmatter (simple parsing)"""
+        lines = read_frontmatter(file)
+        if lines is None:
+            return None
+
+        metadata = {}
+        for line in lines:
+            if ': ' in line:
+                key, value = line.rstrip('\n').split(': ', 1)
+                metadata[key] = value.strip('"')
+
+        metadata['tags'] = orjson.loads(metadata.get('tags', '[]'))
+        if not isinstance(metadata['tags'], list):
+            raise ValueError("tags must be a JSON list")
+        return metadata
+
+def read_frontmatter(path: str) -> Optional[List[str]]:
+    """Read frontmatter lines, stopping at the closing '---'"""
+    lines = []
+    with open(path, 'r', encoding='utf-8') as f:
+        if f.readline().rstrip() != '---':
+            return None
+        for line in f:
+            if line.rstrip() == '---':
+                return lines
+            lines.append(line)
+
+    # Unterminated frontmatter
+    return None
@@ -9,8 +9,19 @@ import json
 import argparse
 from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
+import orjson
 from typing import List, Dict, Optional
 
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+    session.mount("https://", adapter)
+    return session
+
+# Shared by all fetchers so keep-alive connections outlive a single fetcher
+SESSION = _build_session()
+
 class NewsFetcher:
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv('NEWSAPI_KEY')
@@ -19,6 +30,7 @@ class NewsFetcher:
         
         self.base_url = "https://newsapi.org/v2"
         self.headers = {"X-Api-Key": self.api_key}
+        self.session = SESSION
     
     def fetch_articles(self, 
                       query: str, 
@@ -58,9 +70,9 @@ class NewsFetcher:
         """Process API response and format articles"""
         
         try:
-            response = requests.get(endpoint, headers=self.headers, params=params)
+            response = self.session.get(endpoint, headers=self.headers, params=params)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             
             if data["status"] != "ok":
                 raise ValueError(f"API Error: {data.get('message', 'Unknown error')}")
@@ -5,33 +5,115 @@ Processes news articles with Fort-style emotional framing
 """
 
 import os
-import json
 import argparse
 from datetime import datetime
 from pathlib import Path
 import re
-from typing import Dict, List, Optional
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import orjson
 import openai
 from anthropic import Anthropic
+from dispatch_index import DispatchIndex
+from llm_cache import LLMCache
+from adaptive_limiter import AdaptiveLimiter
+
+# Provider responses worth retrying: rate limited, unavailable, overloaded
+RETRYABLE_STATUS = {429, 503, 529}
+MAX_LLM_ATTEMPTS = 5
+
+# Keys every analysis must carry for DispatchGenerator to render it
+ANALYSIS_KEYS = ('summary', 'fort_frame', 'tags', 'voice_family', 'impact_zones')
+
+def _is_valid_analysis(result) -> bool:
+    return isinstance(result, dict) and all(key in result for key in ANALYSIS_KEYS)
+
+# Slug cleanup patterns
+_SLUG_STRIP = re.compile(r'[^\w\s-]')
+_SLUG_DASH = re.compile(r'[-\s]+')
+
+# Keyword tables for basic analysis, in priority order
+TAG_KEYWORDS = {
+    'DOJwatch': ['court', 'trial', 'justice', 'doj'],
+    'eliteFallout': ['elite', 'wealth', 'power'],
+    'SurvivorWitness': ['victim', 'survivor', 'testimony'],
+}
+VOICE_KEYWORDS = {
+    'SurvivorVoice': ['victim', 'survivor', 'trauma'],
+    'RedWitness': ['court', 'legal', 'justice'],
+}
+
+def _compile_keywords(table: Dict[str, List[str]]) -> re.Pattern:
+    """Compile a label -> keywords table into one pattern with a named group per label"""
+    # Lookahead keeps matches zero-width so overlapping keywords are all found
+    groups = '|'.join(
+        f"(?P<{label}>{'|'.join(map(re.escape, words))})"
+        for label, words in table.items()
+    )
+    return re.compile(f"(?=(?:{groups}))")
+
+def _match_labels(pattern: re.Pattern, text: str) -> set:
+    """Labels whose keywords occur anywhere in text (substring matches)"""
+    return {m.lastgroup for m in pattern.finditer(text)}
+
+_TAG_RE = _compile_keywords(TAG_KEYWORDS)
+_VOICE_RE = _compile_keywords(VOICE_KEYWORDS)
 
 class FortParser:
     def __init__(self, llm_provider: str = "openai", api_key: Optional[str] = None):
         self.llm_provider = llm_provider
+        self.api_key = None
         
         if llm_provider == "openai":
             self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+            self.model = "gpt-4"
             if self.api_key:
                 openai.api_key = self.api_key
         elif llm_provider == "anthropic":
             self.api_key = api_key or os.getenv('ANTHROPIC_API_KEY')
+            self.model = "claude-3-opus-20240229"
             if self.api_key:
-                self.client = Anthropic(api_key=self.api_key)
+                # _complete owns retries and backoff, outside the limiter slot
+                self.client = Anthropic(api_key=self.api_key, max_retries=0)
+        
+        # Persistent cache of LLM analyses and shared concurrency limit
+        if self.api_key:
+            self.cache = LLMCache(os.getenv('LLM_CACHE_PATH', '.llm_cache.db'))
+            self.limiter = AdaptiveLimiter()
     
     def analyze_article(self, article: Dict) -> Dict:
         """Analyze article with Fort framing"""
         
-        # Fort framing prompt
-        prompt = f"""
+        prompt = self._build_prompt(article)
+        
+        if not self.api_key:
+            # Fallback analysis without LLM
+            return self._basic_analysis(article)
+        
+        # Identical prompts yield identical analyses at temperature 0
+        cache_key = self._cache_key(prompt)
+        cached = self.cache.get(cache_key)
+        if _is_valid_analysis(cached):
+            return cached
+        
+        try:
+            result = orjson.loads(self._complete(prompt))
+            if not _is_valid_analysis(result):
+                raise ValueError(f"LLM response is not an object with keys {', '.join(ANALYSIS_KEYS)}")
+            
+            self.cache.set(cache_key, result)
+            return result
+            
+        except Exception as e:
+            print(f"LLM analysis failed: {e}. Using basic analysis.")
+            return self._basic_analysis(article)
+    
+    def _build_prompt(self, article: Dict) -> str:
+        """Fort framing prompt for an article"""
+        
+        return f"""
         Analyze this article through the Fort Sentinel lens.
         
         Article: {article['title']}
@@ -50,33 +132,64 @@ class FortParser:
         
         Format as JSON with keys: summary, fort_frame, tags, voice_family, impact_zones
         """
+    
+    def _cache_key(self, prompt: str) -> str:
+        return f"{self.llm_provider}:{self.model}:{prompt}"
+    
+    def _complete(self, prompt: str) -> str:
+        """Call the LLM within the concurrency limit, retrying with backoff"""
         
-        try:
-            if self.llm_provider == "openai" and self.api_key:
-                response = openai.ChatCompletion.create(
-                    model="gpt-4",
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.7
-                )
-                result = json.loads(response.choices[0].message.content)
-            
-            elif self.llm_provider == "anthropic" and self.api_key:
-                message = self.client.messages.create(
-                    model="claude-3-opus-20240229",
-                    max_tokens=1000,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                result = json.loads(message.content[0].text)
-            
-            else:
-                # Fallback analysis without LLM
-                result = self._basic_analysis(article)
-            
-            return result
+        for attempt in range(MAX_LLM_ATTEMPTS):
+            try:
+                with self.limiter.slot():
+                    if self.llm_provider == "openai":
+                        response = openai.ChatCompletion.create(
+                            model=self.model,
+                            messages=[{"role": "user", "content": prompt}],
+                            temperature=0
+                        )
+                        text = response.choices[0].message.content
+                    
+                    else:
+                        message = self.client.messages.create(
+                            model=self.model,
+                            max_tokens=1000,
+                            temperature=0,
+                            messages=[{"role": "user", "content": prompt}]
+                        )
+                        text = message.content[0].text
+                
+                self.limiter.record_success()
+                return text
             
-        except Exception as e:
-            print(f"LLM analysis failed: {e}. Using basic analysis.")
-            return self._basic_analysis(article)
+            except Exception as e:
+                # Anthropic (and openai>=1.0) errors expose status_code; legacy
+                # openai.ChatCompletion (0.x) errors expose http_status
+                status = getattr(e, 'status_code', None) or getattr(e, 'http_status', None)
+                if status not in RETRYABLE_STATUS or attempt == MAX_LLM_ATTEMPTS - 1:
+                    raise
+                if status == 429:
+                    self.limiter.record_rate_limit()
+                
+                # Exponential backoff with jitter, outside the limiter slot
+                time.sleep(min(2 ** attempt, 30) + random.random())
+    
+    def analyze_articles(self, articles: List[Dict], max_workers: int = 8) -> List[Dict]:
+        """Analyze articles concurrently, preserving input order"""
+        
+        if not self.api_key:
+            return [self._basic_analysis(article) for article in articles]
+        
+        # Analyze each distinct prompt once and fan results back out in order
+        keys = [self._cache_key(self._build_prompt(article)) for article in articles]
+        unique = {}
+        for key, article in zip(keys, articles):
+            unique.setdefault(key, article)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = dict(zip(unique, executor.map(self.analyze_article, unique.values())))
+        
+        return [dict(results[key]) for key in keys]
     
     def _basic_analysis(self, article: Dict) -> Dict:
         """Basic analysis without LLM"""
@@ -85,23 +198,14 @@ class FortParser:
         content_lower = (article.get('content', '') or article.get('description', '')).lower()
         
         # Determine tags
-        tags = []
-        if any(word in title_lower for word in ['court', 'trial', 'justice', 'doj']):
-            tags.append('DOJwatch')
-        if any(word in title_lower for word in ['elite', 'wealth', 'power']):
-            tags.append('eliteFallout')
-        if any(word in title_lower for word in ['victim', 'survivor', 'testimony']):
-            tags.append('SurvivorWitness')
+        tag_hits = _match_labels(_TAG_RE, title_lower)
+        tags = [tag for tag in TAG_KEYWORDS if tag in tag_hits]
         if not tags:
             tags = ['TruthEmerging']
         
         # Determine voice
-        if any(word in content_lower for word in ['victim', 'survivor', 'trauma']):
-            voice = 'SurvivorVoice'
-        elif any(word in content_lower for word in ['court', 'legal', 'justice']):
-            voice = 'RedWitness'
-        else:
-            voice = 'TruthKeeper'
+        voice_hits = _match_labels(_VOICE_RE, content_lower)
+        voice = next((v for v in VOICE_KEYWORDS if v in voice_hits), 'TruthKeeper')
         
         return {
             "summary": f"{article['title']}. {article.get('description', 'Details emerging.')}",
@@ -111,56 +215,36 @@ class FortParser:
             "impact_zones": ["Institutional Trust", "Public Consciousness"]
         }
 
-class DispatchGenerator:
-    def __init__(self, output_dir: str = "dispatch"):
-        self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(exist_ok=True)
-    
-    def generate_dispatch(self, article: Dict, analysis: Dict) -> str:
-        """Generate markdown dispatch file"""
-        
-        # Create date-based subdirectory
-        date = datetime.now()
-        date_dir = self.output_dir / date.strftime("%Y-%m-%d")
-        date_dir.mkdir(exist_ok=True)
-        
-        # Generate slug from title
-        slug = re.sub(r'[^\w\s-]', '', article['title'].lower())
-        slug = re.sub(r'[-\s]+', '-', slug)[:50]
-        
-        filename = f"dispatch_{slug}.md"
-        filepath = date_dir / filename
-        
-        # Generate markdown content
-        content = f"""---
-title: {article['title']}
-date: {date.strftime('%Y-%m-%d')}
-time: {date.strftime('%H:%M')}
-source: {article['source']}
-tags: {json.dumps(analysis['tags'])}
-voice: {analysis['voice_family']}
-summary: {analysis['summary']}
-impact_zones: {json.dumps(analysis['impact_zones'])}
+# Markdown layout of a dispatch file, filled with str.format_map
+DISPATCH_TEMPLATE = """---
+title: {title}
+date: {date}
+time: {time}
+source: {source}
+tags: {tags_json}
+voice: {voice}
+summary: {summary}
+impact_zones: {zones_json}
 read_by: FNAFI
 ---
 
-# {article['title']}
+# {title}
 
 ## 🧠 Fort Frame
-{analysis['fort_frame']}
+{fort_frame}
 
 ## 📰 Summary
-{analysis['summary']}
+{summary}
 
 ## 📜 Article Details
-**Source:** {article['source']}  
-**Published:** {article['publishedAt']}  
-**Author:** {article.get('author', 'Unknown')}
+**Source:** {source}  
+**Published:** {published_at}  
+**Author:** {author}
 
 ### Content
-{article.get('content', article.get('description', 'Content not available'))}
+{content}
 
-[Read original →]({article['url']})
+[Read original →]({url})
 
 ## 🎧 Listen Now
 ```bash
@@ -170,12 +254,90 @@ fnafi read "{filepath}"
 ---
 *Generated by Fort Sentinel Dispatch System*
 """
+
+class DispatchGenerator:
+    def __init__(self, output_dir: str = "dispatch"):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(exist_ok=True)
+        self.index = DispatchIndex(output_dir)
+    
+    def generate_dispatch(self, article: Dict, analysis: Dict) -> str:
+        """Generate markdown dispatch file"""
+        
+        date = datetime.now()
+        filepath, content, metadata = self._render_dispatch(article, analysis, date)
         
         # Write file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        self._write_dispatch(filepath, content)
+        
+        # Update metadata index
+        self.index.add(str(filepath), metadata)
         
         return str(filepath)
+    
+    def generate_dispatches(self, items: List[Tuple[Dict, Dict]]) -> List[str]:
+        """Generate dispatch files for (article, analysis) pairs in one batch"""
+        
+        date = datetime.now()
+        entries = []
+        
+        for article, analysis in items:
+            filepath, content, metadata = self._render_dispatch(article, analysis, date)
+            self._write_dispatch(filepath, content)
+            entries.append((str(filepath), metadata))
+        
+        # Index the whole batch in a single transaction
+        self.index.add_many(entries)
+        
+        return [filepath for filepath, _ in entries]
+    
+    def _render_dispatch(self, article: Dict, analysis: Dict, date: datetime) -> Tuple[Path, str, Dict]:
+        """Build dispatch path, markdown content and index metadata"""
+        
+        # Create date-based subdirectory
+        date_dir = self.output_dir / date.strftime("%Y-%m-%d")
+        date_dir.mkdir(exist_ok=True)
+        
+        # Generate slug from title
+        slug = _SLUG_STRIP.sub('', article['title'].lower())
+        slug = _SLUG_DASH.sub('-', slug)[:50]
+        
+        filename = f"dispatch_{slug}.md"
+        filepath = date_dir / filename
+        
+        # Generate markdown content
+        content = DISPATCH_TEMPLATE.format_map({
+            'title': article['title'],
+            'date': date.strftime('%Y-%m-%d'),
+            'time': date.strftime('%H:%M'),
+            'source': article['source'],
+            'tags_json': orjson.dumps(analysis['tags']).decode(),
+            'voice': analysis['voice_family'],
+            'summary': analysis['summary'],
+            'zones_json': orjson.dumps(analysis['impact_zones']).decode(),
+            'fort_frame': analysis['fort_frame'],
+            'published_at': article['publishedAt'],
+            'author': article.get('author', 'Unknown'),
+            'content': article.get('content', article.get('description', 'Content not available')),
+            'url': article['url'],
+            'filepath': filepath
+        })
+        
+        metadata = {
+            'title': article['title'],
+            'date': date.strftime('%Y-%m-%d'),
+            'tags': analysis['tags'],
+            'voice': analysis['voice_family'],
+            'summary': analysis['summary']
+        }
+        
+        return filepath, content, metadata
+    
+    @staticmethod
+    def _write_dispatch(filepath: Path, content: str):
+        """Write dispatch content in a single buffered write"""
+        with open(filepath, 'wb', buffering=65536) as f:
+            f.write(content.encode('utf-8'))
 
 def main():
     parser = argparse.ArgumentParser(description="Generate Fort Sentinel Dispatch from articles")
@@ -184,13 +346,15 @@ def main():
     parser.add_argument("--llm", choices=["openai", "anthropic", "none"], default="none", 
                        help="LLM provider for analysis")
     parser.add_argument("--api-key", "-k", help="API key for LLM provider")
+    parser.add_argument("--workers", "-w", type=int, default=8,
+                       help="Concurrent LLM requests")
     
     args = parser.parse_args()
     
     # Load articles
     try:
-        with open(args.input, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(args.input, 'rb') as f:
+            data = orjson.loads(f.read())
             articles = data['articles']
     except Exception as e:
         print(f"Error loading articles: {e}")
@@ -200,15 +364,14 @@ def main():
     parser = FortParser(args.llm, args.api_key)
     generator = DispatchGenerator(args.output_dir)
     
-    # Process articles
-    dispatches = []
-    for i, article in enumerate(articles):
-        print(f"\nProcessing {i+1}/{len(articles)}: {article['title']}")
-        
-        analysis = parser.analyze_article(article)
-        filepath = generator.generate_dispatch(article, analysis)
-        dispatches.append(filepath)
-        
+    # Analyze articles
+    print(f"Analyzing {len(articles)} articles...")
+    analyses = parser.analyze_articles(articles, max_workers=args.workers)
+    
+    # Generate dispatches
+    dispatches = generator.generate_dispatches(list(zip(articles, analyses)))
+    for i, (article, filepath) in enumerate(zip(articles, dispatches)):
+        print(f"\n{i+1}/{len(articles)}: {article['title']}")
         print(f"Generated: {filepath}")
     
     print(f"\n✅ Generated {len(dispatches)} dispatches")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Fort Sentinel LLM Cache
+SQLite cache of LLM analyses keyed by prompt hash
+"""
+
+import hashlib
+import sqlite3
+import time
+from contextlib import closing
+from typing import Dict, Optional
+import orjson
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    value BLOB,
+    expires_at REAL
+);
+"""
+
+class LLMCache:
+    def __init__(self, db_path: str = ".llm_cache.db", ttl: int = 7 * 24 * 3600):
+        self.db_path = db_path
+        self.ttl = ttl
+
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    @staticmethod
+    def _hash(key: str) -> str:
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached analysis for key, if present and not expired"""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND expires_at > ?",
+                (self._hash(key), time.time())
+            ).fetchone()
+
+        return orjson.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Dict):
+        """Store an analysis for key"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (self._hash(key), orjson.dumps(value), time.time() + self.ttl)
+            )